@@ -1,13 +1,18 @@
+import time
+
+STARTUP_TIME = time.perf_counter()
+
 import hashlib
 import pathlib
 import shutil
+import struct
 import sys
 import zipfile
+import zlib
 from collections import Counter
+from contextlib import nullcontext
 from textwrap import dedent
 
-from PIL import Image
-
 class Atlas():
     def __init__(self, atlas_path: pathlib.Path, img_name: str, img_size: str, img_format: str, img_filter: str, repeat: str):
         self.atlas_path = atlas_path
@@ -55,6 +60,8 @@ def get_image_hash(image_path: pathlib.Path) -> str:
     return hashlib.md5(image_path.read_bytes()).hexdigest()
 
 def decomp(atlas: Atlas):
+    from PIL import Image
+
     atlas_dir = atlas.atlas_path.parent
     atlas_img = Image.open(atlas_dir / atlas.img_name)
     sprites_dir = atlas_dir / 'sprites'
@@ -104,8 +111,155 @@ def check_duplicates(atlas: Atlas):
 
         removed_hash = atlas.sprite_hashes.pop(sprite_name)
         atlas.add_sprite_hash(sprite_name, removed_hash)
-        
+
+class ArchiveEntry():
+    def __init__(self, arcname: str, digest: str, crc: int, method: int, size: int, compress_size: int, data: bytes = None, data_offset: int = None):
+        self.arcname = arcname
+        self.digest = digest
+        self.crc = crc
+        self.method = method
+        self.size = size
+        self.compress_size = compress_size
+        self.data = data
+        self.data_offset = data_offset
+
+ZIP_DATE = (0 << 9) | (1 << 5) | 1
+ZIP_TIME = 0
+ZIP_VERSION = 20
+ZIP_VERSION_MADE_BY = (3 << 8) | ZIP_VERSION
+ZIP_EXTERNAL_ATTR = 0o100644 << 16
+ZIP_DIR_EXTERNAL_ATTR = (0o40755 << 16) | 0x10
+ZIP_FLAG_UTF8 = 0x800
+
+def read_archive_entries(archive_path: pathlib.Path) -> dict:
+    entries = {}
+
+    if not archive_path.exists():
+        return entries
+
+    try:
+        with zipfile.ZipFile(str(archive_path)) as zipf, archive_path.open('rb') as raw:
+            for info in zipf.infolist():
+                raw.seek(info.header_offset)
+                header = raw.read(30)
+                name_length, extra_length = struct.unpack('<HH', header[26:30])
+
+                try:
+                    digest = info.comment.decode('ascii')
+                except UnicodeDecodeError:
+                    digest = None
+
+                if digest is not None and (len(digest) != 32 or any(c not in '0123456789abcdef' for c in digest)):
+                    digest = None
+
+                entries[info.filename] = ArchiveEntry(
+                    info.filename,
+                    digest,
+                    info.CRC,
+                    info.compress_type,
+                    info.file_size,
+                    info.compress_size,
+                    data_offset=info.header_offset + 30 + name_length + extra_length,
+                )
+    except (zipfile.BadZipFile, OSError, struct.error):
+        return {}
+
+    return entries
+
+def compress_entry(arcname: str, content: bytes, digest: str) -> ArchiveEntry:
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    data = compressor.compress(content) + compressor.flush()
+    method = zipfile.ZIP_DEFLATED
+
+    if len(data) >= len(content):
+        data = content
+        method = zipfile.ZIP_STORED
+
+    return ArchiveEntry(arcname, digest, zlib.crc32(content), method, len(content), len(data), data)
+
+def build_entry(arcname: str, file_path: pathlib.Path, previous: dict) -> ArchiveEntry:
+    if file_path.is_dir():
+        return ArchiveEntry(arcname, None, 0, zipfile.ZIP_STORED, 0, 0, b'')
+
+    content = file_path.read_bytes()
+    digest = hashlib.md5(content).hexdigest()
+    old_entry = previous.get(arcname)
+
+    if old_entry is not None and old_entry.digest == digest:
+        return old_entry
+
+    return compress_entry(arcname, content, digest)
+
+def write_mod_archive(mod_dir: pathlib.Path, archive_path: pathlib.Path) -> bool:
+    """Zip mod_dir into archive_path, returning False if the archive was already up to date.
+
+    Entries are sorted and carry a fixed timestamp so identical input gives a
+    byte-identical archive. Each file entry stores the md5 of its content in
+    its comment, letting unchanged entries be copied from the previous archive
+    without being compressed again.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    previous = read_archive_entries(archive_path)
+
+    files = sorted(
+        (file_path.relative_to(mod_dir).as_posix() + ('/' if file_path.is_dir() else ''), file_path)
+        for file_path in mod_dir.rglob('*')
+    )
+
+    with ThreadPoolExecutor() as executor:
+        entries = list(executor.map(lambda f: build_entry(*f, previous), files))
+
+    unchanged = (
+        archive_path.exists()
+        and list(previous) == [entry.arcname for entry in entries]
+        and all(previous[entry.arcname].digest == entry.digest for entry in entries)
+    )
+    if unchanged:
+        return False
+
+    central_records = []
+    temp_path = archive_path.with_name(archive_path.name + '.tmp')
+
+    try:
+        with temp_path.open('wb') as file, (archive_path.open('rb') if previous else nullcontext()) as old_archive:
+            for entry in entries:
+                if entry.data is None:
+                    old_archive.seek(entry.data_offset)
+                    data = old_archive.read(entry.compress_size)
+                else:
+                    data = entry.data
+
+                name = entry.arcname.encode('utf-8')
+                comment = (entry.digest or '').encode('ascii')
+                flags = 0 if entry.arcname.isascii() else ZIP_FLAG_UTF8
+                external_attr = ZIP_DIR_EXTERNAL_ATTR if entry.arcname.endswith('/') else ZIP_EXTERNAL_ATTR
+                fields = (ZIP_VERSION, flags, entry.method, ZIP_TIME, ZIP_DATE, entry.crc, entry.compress_size, entry.size)
+
+                central_records += [
+                    struct.pack('<4s6HL2L5HLL', b'PK\x01\x02', ZIP_VERSION_MADE_BY, *fields, len(name), 0, len(comment), 0, 0, external_attr, file.tell()),
+                    name,
+                    comment,
+                ]
+
+                file.write(struct.pack('<4s5HL2L2H', b'PK\x03\x04', *fields, len(name), 0))
+                file.write(name)
+                file.write(data)
+
+            central_directory = b''.join(central_records)
+            file.write(central_directory)
+            file.write(struct.pack('<4s4H2LH', b'PK\x05\x06', 0, 0, len(entries), len(entries), len(central_directory), file.tell() - len(central_directory), 0))
+
+        temp_path.replace(archive_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    return True
+
 def rebuild(atlas: Atlas):
+    from PIL import Image
+
     canvas = Image.new('RGBA', tuple(map(int, atlas.img_size.split(', '))), (255,255,255,0))
 
     for sprite_name, attributes in atlas.get_sprites().items():
@@ -118,6 +272,8 @@ def rebuild(atlas: Atlas):
     canvas.save(output_dir / atlas.img_name)
 
 def export_mod_full(atlas: Atlas, icon_path: pathlib.Path):
+    from PIL import Image
+
     rebuild(atlas)
 
     atlas_dir = atlas.atlas_path.parent
@@ -165,12 +321,12 @@ def export_mod_full(atlas: Atlas, icon_path: pathlib.Path):
 
     shutil.copy(icon_path, str(pathlib.Path(mod_dir / 'icon.png')))
     
-    with zipfile.ZipFile(str(output_dir / 'FullAtlas.mod'), 'w') as zipf:
-        for file_path in mod_dir.rglob('*'):
-            zipf.write(file_path, arcname=file_path.relative_to(mod_dir))
+    write_mod_archive(mod_dir, output_dir / 'FullAtlas.mod')
 
 
 def export_mod_modified(atlas: Atlas, icon_path: pathlib.Path):
+    from PIL import Image
+
     atlas_dir = atlas.atlas_path.parent
     sprites_dir = atlas_dir / 'sprites'
     output_dir = atlas.atlas_path.parent / 'output'
@@ -237,9 +393,7 @@ def export_mod_modified(atlas: Atlas, icon_path: pathlib.Path):
 
     shutil.copy(icon_path, str(pathlib.Path(mod_dir / 'icon.png')))
     
-    with zipfile.ZipFile(str(output_dir / 'PartialAtlas.mod'), 'w') as zipf:
-        for file_path in mod_dir.rglob('*'):
-            zipf.write(file_path, arcname=file_path.relative_to(mod_dir))
+    write_mod_archive(mod_dir, output_dir / 'PartialAtlas.mod')
 
 def resource_path(relative: pathlib.Path):
     try:
@@ -249,10 +403,14 @@ def resource_path(relative: pathlib.Path):
 
     return base_path / relative
 
-if __name__ == '__main__':
-    from ui.mainwindow import MainWindow
+def main():
+    import threading
+
+    theme_loader = threading.Thread(target=__import__, args=('qdarktheme',), daemon=True)
+    theme_loader.start()
+
     from PySide6.QtWidgets import QApplication
-    import qdarktheme
+    from ui.mainwindow import MainWindow
 
     try:
         from ctypes import windll
@@ -262,8 +420,19 @@ if __name__ == '__main__':
 
     icon_path = resource_path(pathlib.Path('ui/icon.png'))
 
+    on_first_paint = None
+    if '--startup-time' in sys.argv:
+        on_first_paint = lambda: print(f'Time to first window: {(time.perf_counter() - STARTUP_TIME) * 1000:.0f} ms')
+
     app = QApplication()
+
+    theme_loader.join()
+    import qdarktheme
     qdarktheme.setup_theme('dark')
-    mainwindow = MainWindow(icon_path=icon_path)
+
+    mainwindow = MainWindow(icon_path=icon_path, on_first_paint=on_first_paint)
     mainwindow.show()
-    app.exec()
\ No newline at end of file
+    app.exec()
+
+if __name__ == '__main__':
+    main()
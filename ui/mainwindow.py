@@ -41,8 +41,6 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from pokeatlas import decomp, check_duplicates, rebuild, get_atlas, export_mod_full, export_mod_modified
-
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 400
 
@@ -109,13 +107,14 @@ class EmptyIconProvider(QFileIconProvider):
         return QIcon()
 
 class MainWindow(QMainWindow):
-    def __init__(self, icon_path: pathlib.Path):
+    def __init__(self, icon_path: pathlib.Path, on_first_paint=None):
         super().__init__()
         self.atlas_dir = None
         self.sprites_dir = None
         self.output_dir = None
         self.atlas = None
         self.icon_path = icon_path
+        self.on_first_paint = on_first_paint
 
         self.selected_sprite_filename = None
 
@@ -197,6 +196,13 @@ class MainWindow(QMainWindow):
         layout.addWidget(label, alignment=Qt.AlignmentFlag.AlignCenter)
         self.setCentralWidget(widget)
 
+    def paintEvent(self, event):
+        super().paintEvent(event)
+
+        if self.on_first_paint is not None:
+            on_first_paint, self.on_first_paint = self.on_first_paint, None
+            on_first_paint()
+
     def displayAtlas(self):
         widget = QWidget(self)
         self.model = QFileSystemModel()
@@ -290,7 +296,9 @@ class MainWindow(QMainWindow):
         self.atlas_dir = self.atlas_filepath.parent
         self.sprites_dir = self.atlas_dir / 'sprites'
         self.output_dir = self.atlas_dir / 'output'
-        
+
+        from pokeatlas import decomp, get_atlas
+
         self.atlas = get_atlas(self.atlas_filepath)
         decomp(self.atlas)
         self.displayAtlas()
@@ -301,16 +309,22 @@ class MainWindow(QMainWindow):
         self.sprite_list.setCurrentIndex(self.sprite_list.indexAt(QPoint(0,0)))
 
     def saveAtlas(self):
+        from pokeatlas import check_duplicates, rebuild
+
         check_duplicates(self.atlas)
         rebuild(self.atlas)
         self.openDirectory(self.output_dir)
 
     def saveFullMod(self):
+        from pokeatlas import check_duplicates, export_mod_full
+
         check_duplicates(self.atlas)
         export_mod_full(self.atlas, self.icon_path)
         self.openDirectory(self.output_dir)
 
     def saveModifiedMod(self):
+        from pokeatlas import export_mod_modified
+
         export_mod_modified(self.atlas, self.icon_path)
         self.openDirectory(self.output_dir)
 